@@ -16,6 +16,7 @@ import threading
 from typing import Optional
 
 from .encoder import AdaptiveHuffman
+from .framing import recv_exact, send_frame
 
 DEFAULT_PORT = 9000
 
@@ -31,13 +32,14 @@ def receive_loop(sock: socket.socket, decoder: AdaptiveHuffman) -> None:
                 print("Incomplete length prefix from server.")
                 break
             (length,) = struct.unpack("!I", prefix)
-            payload = b""
-            while len(payload) < length:
-                chunk = sock.recv(length - len(payload))
-                if not chunk:
-                    print("Server closed connection.")
-                    return
-                payload += chunk
+            try:
+                payload = recv_exact(sock, length)
+            except ValueError as exc:
+                print(f"{exc} from server.")
+                break
+            except ConnectionError:
+                print("Server closed connection.")
+                break
             try:
                 message = decoder.decode(payload)
                 print(f"\r[IN] {message}\n> ", end="", flush=True)
@@ -49,8 +51,9 @@ def receive_loop(sock: socket.socket, decoder: AdaptiveHuffman) -> None:
 
 
 def run_client(host: str, port: int, username: str) -> None:
-    encoder = AdaptiveHuffman()
-    decoder = AdaptiveHuffman()
+    # Each instance is only touched by one thread (stdin loop / receive_loop).
+    encoder = AdaptiveHuffman(thread_safe=False)
+    decoder = AdaptiveHuffman(thread_safe=False)
 
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         try:
@@ -73,7 +76,7 @@ def run_client(host: str, port: int, username: str) -> None:
                 payload = encoder.encode(full_message)
                 prefix = struct.pack("!I", len(payload))
                 try:
-                    sock.sendall(prefix + payload)
+                    send_frame(sock, prefix, payload)
                 except OSError:
                     print("Disconnected from server.")
                     break
@@ -9,115 +9,157 @@ interactive chat compression.  The public API is intentionally small:
     >>> text = dec.decode(data)
     >>> assert text == "hello world hello"
 
-The implementation is **thread-safe** – a `threading.Lock` guards
-modifications to the internal tree so concurrent encode / decode calls
-on the same instance won't corrupt state.
+The implementation is **thread-safe** by default – a `threading.Lock`
+guards modifications to the internal tree so concurrent encode / decode
+calls on the same instance won't corrupt state.  Instances confined to a
+single thread can pass ``thread_safe=False`` to skip the locking.
 """
 
 from __future__ import annotations
 
+import contextlib
+import struct
 import threading
-from typing import Dict, List, Optional
+from typing import ContextManager, Dict, List, Optional, Tuple
 
 __all__ = [
     "AdaptiveHuffman",
 ]
 
+_U16 = struct.Struct(">H")
+_U64 = struct.Struct(">Q")
 
-class _BitWriter:
-    """Accumulates individual bits and produces a bytes object."""
-
-    def __init__(self) -> None:
-        self._buffer: bytearray = bytearray()
-        self._current: int = 0
-        self._filled: int = 0  # number of bits filled in _current
 
-    def add_bit(self, bit: bool) -> None:
-        self._current = (self._current << 1) | int(bit)
-        self._filled += 1
-        if self._filled == 8:
-            self._buffer.append(self._current)
-            self._current = 0
-            self._filled = 0
-
-    def add_bits(self, bits: List[bool]) -> None:
-        for b in bits:
-            self.add_bit(b)
+class _BitWriter:
+    """Accumulates bits in a 64-bit queue and produces a bytes object.
+
+    Output goes into a preallocated buffer (grown on demand) tracked by
+    ``_pos``, so the hot path writes in place instead of appending.
+    """
+
+    def __init__(self, size_hint: int = 64) -> None:
+        self._buffer: bytearray = bytearray(size_hint)
+        self._pos: int = 0  # number of bytes written to _buffer
+        self._acc: int = 0
+        self._nbits: int = 0  # number of pending bits held in _acc
+
+    def _reserve(self, n: int) -> None:
+        if self._pos + n > len(self._buffer):
+            self._buffer.extend(bytes(max(n, len(self._buffer))))
+
+    def _write(self, data: bytes) -> None:
+        n = len(data)
+        self._reserve(n)
+        self._buffer[self._pos : self._pos + n] = data
+        self._pos += n
+
+    def add_bits_int(self, code: int, nbits: int) -> None:
+        """Append the low *nbits* of *code*, most significant bit first."""
+        self._acc = (self._acc << nbits) | code
+        self._nbits += nbits
+        while self._nbits >= 64:
+            # Blit the top 64 queued bits as one big-endian word
+            self._nbits -= 64
+            if self._pos + 8 > len(self._buffer):
+                self._reserve(8)
+            _U64.pack_into(self._buffer, self._pos, self._acc >> self._nbits)
+            self._pos += 8
+            self._acc &= (1 << self._nbits) - 1
 
     def flush_to_byte(self) -> None:
-        """Pad with zeros up to byte boundary and flush current byte."""
-        if self._filled == 0:
+        """Pad with zeros up to byte boundary and flush all pending bits."""
+        if self._nbits == 0:
             return
-        self._current <<= 8 - self._filled
-        self._buffer.append(self._current)
-        self._current = 0
-        self._filled = 0
-
-    def add_uint16(self, value: int) -> None:
-        """Write 16-bit unsigned integer in big-endian order at byte boundary."""
+        pad = -self._nbits & 7
+        nbytes = (self._nbits + pad) >> 3
+        self._write((self._acc << pad).to_bytes(nbytes, "big"))
+        self._acc = 0
+        self._nbits = 0
+
+    def write_length_prefixed(self, data: bytes) -> None:
+        """Write *data* behind a big-endian uint16 length, at a byte boundary."""
         self.flush_to_byte()
-        self._buffer.extend(value.to_bytes(2, "big", signed=False))
+        n = len(data)
+        self._reserve(2 + n)
+        pos = self._pos
+        _U16.pack_into(self._buffer, pos, n)
+        self._buffer[pos + 2 : pos + 2 + n] = data
+        self._pos = pos + 2 + n
 
-    def add_bytes(self, data: bytes) -> None:
-        self.flush_to_byte()
-        self._buffer.extend(data)
+    def is_byte_aligned(self) -> bool:
+        return self._nbits & 7 == 0
 
     def get_data(self) -> bytes:
         self.flush_to_byte()
-        return bytes(self._buffer)
+        return bytes(memoryview(self._buffer)[: self._pos])
 
 
 class _BitReader:
-    """Reads bits and byte-aligned data from a bytes object."""
+    """Reads bits and byte-aligned data from a bytes object.
+
+    Bits are served from a window of up to 64 bits (``_win``) refilled
+    eight bytes at a time; ``_byte_pos`` is the next byte to load.
+    """
 
     def __init__(self, data: bytes) -> None:
         self._data = data
         self._byte_pos: int = 0
-        self._bit_pos: int = 0  # 0–7, bit index inside current byte
-
-    def _require_bits(self, n: int) -> None:
-        remaining_bits = (len(self._data) - self._byte_pos) * 8 - self._bit_pos
-        if n > remaining_bits:
-            raise ValueError("Not enough bits left in stream")
-
-    def read_bit(self) -> bool:
-        self._require_bits(1)
-        bit = (self._data[self._byte_pos] >> (7 - self._bit_pos)) & 1
-        self._bit_pos += 1
-        if self._bit_pos == 8:
-            self._bit_pos = 0
-            self._byte_pos += 1
-        return bool(bit)
+        self._win: int = 0
+        self._win_bits: int = 0  # number of unread bits at the bottom of _win
+
+    def fill(self) -> None:
+        """Top the window up to at least 57 bits (or to the end of the data)."""
+        n = (64 - self._win_bits) >> 3
+        chunk = self._data[self._byte_pos : self._byte_pos + n]
+        self._byte_pos += len(chunk)
+        # Drop consumed bits so the window never grows beyond 64 bits
+        self._win = ((self._win & ((1 << self._win_bits) - 1)) << (len(chunk) << 3)) | int.from_bytes(
+            chunk, "big"
+        )
+        self._win_bits += len(chunk) << 3
+
+    def read_bit(self) -> int:
+        if self._win_bits == 0:
+            self.fill()
+            if self._win_bits == 0:
+                raise ValueError("Not enough bits left in stream")
+        self._win_bits -= 1
+        return (self._win >> self._win_bits) & 1
 
     def align_to_byte(self) -> None:
-        if self._bit_pos == 0:
-            return
-        self._bit_pos = 0
-        self._byte_pos += 1
+        # The window always ends on a byte boundary of the input.
+        self._win_bits &= ~7
 
-    def read_uint16(self) -> int:
+    def _rewind_window(self) -> None:
+        """Hand whole bytes still in the window back to byte-level reads."""
         self.align_to_byte()
-        if self._byte_pos + 2 > len(self._data):
+        self._byte_pos -= self._win_bits >> 3
+        self._win = 0
+        self._win_bits = 0
+
+    def read_length_prefixed(self) -> bytes:
+        """Read a uint16 length followed by that many bytes, from a byte boundary."""
+        self._rewind_window()
+        pos = self._byte_pos
+        if pos + 2 > len(self._data):
             raise ValueError("Unexpected end of stream while reading uint16")
-        value = int.from_bytes(self._data[self._byte_pos : self._byte_pos + 2], "big")
-        self._byte_pos += 2
-        return value
-
-    def read_bytes(self, length: int) -> bytes:
-        self.align_to_byte()
-        if self._byte_pos + length > len(self._data):
+        (length,) = _U16.unpack_from(self._data, pos)
+        pos += 2
+        if pos + length > len(self._data):
             raise ValueError("Unexpected end of stream while reading bytes")
-        out = self._data[self._byte_pos : self._byte_pos + length]
-        self._byte_pos += length
-        return out
+        self._byte_pos = pos + length
+        return self._data[pos : pos + length]
 
     def has_bits(self) -> bool:
-        remaining_bits = (len(self._data) - self._byte_pos) * 8 - self._bit_pos
-        return remaining_bits > 0
+        return self._win_bits > 0 or self._byte_pos < len(self._data)
 
 
 class _Node:
-    """Single tree node."""
+    """Single tree node.
+
+    NYT / NCW are identified by identity (``AdaptiveHuffman._nyt`` /
+    ``_ncw``) rather than per-node flags, keeping every node to six slots.
+    """
 
     __slots__ = (
         "symbol",
@@ -126,8 +168,6 @@ class _Node:
         "left",
         "right",
         "parent",
-        "is_nyt",
-        "is_ncw",
     )
 
     def __init__(
@@ -136,8 +176,6 @@ class _Node:
         symbol: Optional[str] = None,
         weight: int = 0,
         key: int = 0,
-        is_nyt: bool = False,
-        is_ncw: bool = False,
     ) -> None:
         self.symbol: Optional[str] = symbol
         self.weight: int = weight
@@ -145,8 +183,6 @@ class _Node:
         self.left: Optional["_Node"] = None
         self.right: Optional["_Node"] = None
         self.parent: Optional["_Node"] = None
-        self.is_nyt: bool = is_nyt
-        self.is_ncw: bool = is_ncw
 
     def is_leaf(self) -> bool:
         return self.left is None and self.right is None
@@ -155,20 +191,25 @@ class _Node:
 class AdaptiveHuffman:
     """Thread-safe word-level adaptive Huffman encoder/decoder."""
 
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
+    def __init__(self, *, thread_safe: bool = True) -> None:
+        self._lock: ContextManager[object] = threading.Lock() if thread_safe else contextlib.nullcontext()
         self._leaves: Dict[str, _Node] = {}
         self._next_key: int = 3  # 0 reserved for dummy, 1 NYT, 2 NCW, 3 root
 
         # Create special leaves and root
-        self._nyt = _Node(is_nyt=True, key=1)
-        self._ncw = _Node(is_ncw=True, key=2)
+        self._nyt = _Node(key=1)
+        self._ncw = _Node(key=2)
         self._root = _Node(key=3, weight=0)
         self._root.left = self._nyt
         self._root.right = self._ncw
         self._nyt.parent = self._root
         self._ncw.parent = self._root
 
+        # weight -> nodes of that weight, sorted by ascending key
+        self._blocks: Dict[int, List[_Node]] = {}
+        for node in (self._nyt, self._ncw, self._root):
+            self._add_to_block(node)
+
     # ---------------------------------------------------------------------
     # Public API
     # ---------------------------------------------------------------------
@@ -183,36 +224,45 @@ class AdaptiveHuffman:
             return self._decode_internal(data)
 
     # ------------------------------------------------------------------
-    # Internal helpers – all called WITH the lock already held.
+    # Internal helpers – all called WITH the lock (if any) already held.
     # ------------------------------------------------------------------
 
     def _encode_internal(self, text: str) -> bytes:
-        writer = _BitWriter()
         words = text.split(" ") if text else []
-        for idx, word in enumerate(words):
-            if idx != 0:
-                self._encode_word(" ", writer)  # separator symbol
+        # One byte per character (raw bytes of new words) plus a few code
+        # bytes per symbol; non-ASCII text or long codes grow the writer.
+        size_hint = len(text) + 8 * len(words) + 16
+        writer = _BitWriter(size_hint)
+        if not words:
+            return writer.get_data()
+
+        tokens = iter(words)
+        self._encode_word(next(tokens), writer)
+        for word in tokens:
+            self._encode_word(" ", writer)  # separator symbol
             self._encode_word(word, writer)
+        if not writer.is_byte_aligned():
+            # Terminate with the NYT code so the decoder doesn't read the
+            # zero padding of the last byte as another codeword.
+            writer.add_bits_int(*self._path_to_node(self._nyt))
         return writer.get_data()
 
     def _encode_word(self, word: str, writer: _BitWriter) -> None:
         new_word = word not in self._leaves
         # Step 1: output codeword (existing or NCW)
         target_node = self._leaves.get(word, self._ncw)
-        path = self._path_to_node(target_node)
-        writer.add_bits(path)
+        code, nbits = self._path_to_node(target_node)
+        writer.add_bits_int(code, nbits)
 
         # Step 2: if new word, write raw bytes length + data and insert into tree
         if new_word:
-            # Align to byte boundary to simplify reader
-            writer.flush_to_byte()
+            # Byte-aligned (simplifies the reader) uint16 length + UTF-8 bytes
             raw = word.encode()
             if len(raw) >= 2 ** 16:
                 raise ValueError("Word too long to encode (>65535 bytes)")
-            writer.add_uint16(len(raw))
-            writer.add_bytes(raw)
+            self._increment_weight(self._ncw)  # NCW weight++ (matches decoder order)
+            writer.write_length_prefixed(raw)
             self._insert_new_word(word)
-            # Update NCW weight (already part of incrementWeight in insert)
         else:
             # Known word – just increment its node weight after emitting path
             self._increment_weight(self._leaves[word])
@@ -225,29 +275,28 @@ class AdaptiveHuffman:
         words: List[str] = []
         while reader.has_bits():
             word = self._decode_next_word(reader)
+            if word is None:
+                break  # NYT end marker; the rest is padding
             if word == " ":
                 continue  # separator
             words.append(word)
         return " ".join(words)
 
-    def _decode_next_word(self, reader: _BitReader) -> str:
+    def _decode_next_word(self, reader: _BitReader) -> Optional[str]:
         node = self._root
         while not node.is_leaf():
             bit = reader.read_bit()
             node = node.right if bit else node.left  # type: ignore[assignment]
 
-        if node.is_ncw:
+        if node is self._ncw:
             # NCW: read new word raw bytes, insert, return
             self._increment_weight(node)  # NCW weight++ (matches encoder order)
-            reader.align_to_byte()
-            length = reader.read_uint16()
-            raw = reader.read_bytes(length)
-            word = raw.decode()
+            word = reader.read_length_prefixed().decode()
             self._insert_new_word(word)
             return word
-        elif node.is_nyt:
-            # Should not appear in our encoding flow, but return empty string.
-            return ""
+        elif node is self._nyt:
+            # End-of-message marker written before byte padding.
+            return None
         else:
             # Existing word
             self._increment_weight(node)
@@ -262,15 +311,16 @@ class AdaptiveHuffman:
         new_word_leaf = _Node(symbol=word, weight=0, key=self._next_key)
         self._next_key += 1
 
-        new_nyt = _Node(is_nyt=True, key=self._next_key)
+        new_nyt = _Node(key=self._next_key)
         self._next_key += 1
 
-        internal = self._nyt
-        internal.is_nyt = False  # it becomes internal
+        internal = self._nyt  # it becomes internal
         internal.left = new_nyt
         internal.right = new_word_leaf
         new_nyt.parent = internal
         new_word_leaf.parent = internal
+        self._add_to_block(new_word_leaf)
+        self._add_to_block(new_nyt)
 
         # Register new structures
         self._leaves[word] = new_word_leaf
@@ -279,46 +329,86 @@ class AdaptiveHuffman:
         # Weight update – start at new_word_leaf (weight 0) and bubble up
         self._increment_weight(new_word_leaf)
 
-    def _path_to_node(self, node: _Node) -> List[bool]:
-        path: List[bool] = []
+    def _path_to_node(self, node: _Node) -> Tuple[int, int]:
+        """Return ``(code, nbits)`` – the root-to-*node* path as an integer."""
+        code = 0
+        nbits = 0
         current = node
         while current is not self._root:
             parent = current.parent
             if parent is None:
                 raise RuntimeError("Node has no parent – corrupted tree")
-            path.append(parent.right is current)
+            # Walking upwards yields the code's bits least significant first.
+            if parent.right is current:
+                code |= 1 << nbits
+            nbits += 1
             current = parent
-        path.reverse()
-        return path
+        return code, nbits
 
     # -------------------- weight maintenance -----------------------
     def _increment_weight(self, node: _Node) -> None:
+        # Hot loop: removal from the old block is inlined and lookups hoisted
+        # to locals, since per-level overhead dominates the cost of an update.
+        blocks = self._blocks
+        find_highest = self._find_highest_node_in_block
+        add_to_block = self._add_to_block
         while node is not None:
-            # Find highest-key node in same weight block
-            highest = self._find_highest_node_in_block(node)
-            if highest is not node and node.parent is not highest and highest.parent is not node:
-                self._swap_nodes(node, highest)
-            node.weight += 1
+            weight = node.weight
+            block = blocks[weight]
+            if block[-1] is node:
+                # Fast path: already the highest key in its block, so there
+                # is nothing to swap with.
+                block.pop()
+            else:
+                # Find highest-key node in same weight block
+                highest = find_highest(node)
+                if highest is not node and node.parent is not highest and highest.parent is not node:
+                    self._swap_nodes(node, highest)
+                block.remove(node)
+
+            # Move node from its weight block to the next one
+            if not block:
+                del blocks[weight]
+            node.weight = weight + 1
+            add_to_block(node)
             node = node.parent
 
     def _find_highest_node_in_block(self, node: _Node) -> _Node:
         """Return highest-key node (not in `node`'s subtree) with same weight."""
-        target_weight = node.weight
-        highest: Optional[_Node] = node
-        stack = [self._root]
-        while stack:
-            cur = stack.pop()
-            if cur.weight == target_weight and cur.key > highest.key and not self._is_ancestor(cur, node):
-                highest = cur
-            if cur.left:
-                stack.append(cur.left)
-            if cur.right:
-                stack.append(cur.right)
-        return highest
+        for cur in reversed(self._blocks[node.weight]):
+            if cur.key <= node.key:
+                break
+            if not self._is_ancestor(cur, node) and not self._is_ancestor(node, cur):
+                return cur
+        return node
+
+    def _add_to_block(self, node: _Node) -> None:
+        """Insert *node* into its weight block, keeping the block key-ordered."""
+        block = self._blocks.get(node.weight)
+        key = node.key
+        if block is None:
+            self._blocks[node.weight] = [node]
+        elif block[-1].key <= key:
+            # Common case: node has the highest key in its new block
+            block.append(node)
+        else:
+            # Last entry is known to be larger, so search only before it
+            lo, hi = 0, len(block) - 1
+            while lo < hi:
+                mid = (lo + hi) >> 1
+                if block[mid].key <= key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            block.insert(lo, node)
 
     def _is_ancestor(self, anc: _Node, descendant: _Node) -> bool:
+        # Weights never decrease towards the root, so the walk can stop once
+        # it passes anc's weight.  The +1 allows for the path _increment_weight
+        # is part-way through, whose lower nodes are already one ahead.
+        limit = anc.weight + 1
         current = descendant.parent
-        while current is not None:
+        while current is not None and current.weight <= limit:
             if current is anc:
                 return True
             current = current.parent
@@ -352,9 +442,9 @@ class AdaptiveHuffman:
         while stack:
             node, depth = stack.pop()
             indent = "  " * depth
-            if node.is_ncw:
+            if node is self._ncw:
                 label = "<NCW>"
-            elif node.is_nyt:
+            elif node is self._nyt:
                 label = "<NYT>"
             elif node.symbol == " ":
                 label = "<SPACE>"
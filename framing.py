@@ -0,0 +1,52 @@
+"""Length-prefixed framing shared by the chat client and server.
+
+Every message on the wire is a 4-byte big-endian length followed by that
+many bytes of encoded payload.
+"""
+
+from __future__ import annotations
+
+import socket
+from typing import Union
+
+__all__ = [
+    "MAX_PAYLOAD",
+    "recv_exact",
+    "send_frame",
+]
+
+MAX_PAYLOAD = 1_000_000  # 1 MB max safety limit
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+
+def send_frame(sock: socket.socket, prefix: bytes, payload: Union[bytes, bytearray, memoryview]) -> None:
+    """Send *prefix* and *payload* back to back without concatenating them."""
+    if not _HAS_SENDMSG:  # e.g. Windows
+        sock.sendall(b"".join((prefix, payload)))
+        return
+    sent = sock.sendmsg([prefix, payload])
+    if sent < len(prefix):
+        sock.sendall(prefix[sent:])
+        sock.sendall(payload)
+    elif sent < len(prefix) + len(payload):
+        sock.sendall(memoryview(payload)[sent - len(prefix) :])
+
+
+def recv_exact(sock: socket.socket, length: int) -> bytearray:
+    """Receive exactly *length* payload bytes into a presized buffer.
+
+    Raises ``ValueError`` if *length* is outside ``1..MAX_PAYLOAD`` (nothing
+    is allocated or read) and ``ConnectionError`` if the peer disconnects
+    before the payload is complete.
+    """
+    if not 0 < length <= MAX_PAYLOAD:
+        raise ValueError(f"Invalid payload length {length}")
+    payload = bytearray(length)
+    view = memoryview(payload)
+    received = 0
+    while received < length:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise ConnectionError("Unexpected disconnect while receiving payload")
+        received += n
+    return payload
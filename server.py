@@ -13,15 +13,15 @@ import socket
 import struct
 import threading
 from pathlib import Path
-from typing import List
+from typing import List, Union
 
 from .encoder import AdaptiveHuffman
+from .framing import recv_exact, send_frame
 
 DEFAULT_PORT = 9000
-MAX_PAYLOAD = 1_000_000  # 1 MB max safety limit
 
 
-def broadcast(clients: List[socket.socket], payload: bytes, sender: socket.socket, lock: threading.Lock) -> None:
+def broadcast(clients: List[socket.socket], payload: Union[bytes, bytearray], sender: socket.socket, lock: threading.Lock) -> None:
     length_prefix = struct.pack("!I", len(payload))
     with lock:
         dead: List[socket.socket] = []
@@ -29,7 +29,7 @@ def broadcast(clients: List[socket.socket], payload: bytes, sender: socket.socke
             if client is sender:
                 continue
             try:
-                client.sendall(length_prefix + payload)
+                send_frame(client, length_prefix, payload)
             except OSError:
                 dead.append(client)
         for d in dead:
@@ -38,7 +38,7 @@ def broadcast(clients: List[socket.socket], payload: bytes, sender: socket.socke
 
 
 def client_thread(conn: socket.socket, addr: tuple[str, int], clients: List[socket.socket], lock: threading.Lock) -> None:
-    decoder = AdaptiveHuffman()
+    decoder = AdaptiveHuffman(thread_safe=False)  # private to this thread
     try:
         while True:
             # Read 4-byte big-endian length prefix
@@ -49,14 +49,7 @@ def client_thread(conn: socket.socket, addr: tuple[str, int], clients: List[sock
                 # socket closed mid-prefix
                 break
             (length,) = struct.unpack("!I", length_raw)
-            if length == 0 or length > MAX_PAYLOAD:
-                break
-            payload = b""
-            while len(payload) < length:
-                chunk = conn.recv(length - len(payload))
-                if not chunk:
-                    raise ConnectionError("Unexpected disconnect while receiving payload")
-                payload += chunk
+            payload = recv_exact(conn, length)
             # Decode and print
             try:
                 message = decoder.decode(payload)
@@ -66,7 +59,7 @@ def client_thread(conn: socket.socket, addr: tuple[str, int], clients: List[sock
                 continue
             # Broadcast raw payload
             broadcast(clients, payload, conn, lock)
-    except (OSError, ConnectionError):
+    except (OSError, ValueError):
         pass
     finally:
         with lock:
@@ -0,0 +1,82 @@
+"""Regression tests for the adaptive Huffman codec.
+
+The package uses relative imports, so run the tests as package modules
+from the directory that contains ``chat_huffman_py``::
+
+    $ python -m unittest chat_huffman_py.test_encoder
+"""
+
+from __future__ import annotations
+
+import random
+import unittest
+from typing import List
+
+from .encoder import AdaptiveHuffman
+
+
+def _chat_session(seed: int, messages: int) -> List[str]:
+    """Zipf-ish chat lines, with empty words, unicode and long words mixed in."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(300)] + ["", "héllo", "日本語", "x" * 300]
+    lines = []
+    for _ in range(messages):
+        n = rng.randint(0, 20)
+        words = [vocab[min(int(rng.paretovariate(1.0)) - 1, len(vocab) - 1)] for _ in range(n)]
+        lines.append(" ".join(words))
+    return lines
+
+
+class RoundTripTest(unittest.TestCase):
+    def assertRoundTrips(self, messages: List[str]) -> None:
+        enc, dec = AdaptiveHuffman(), AdaptiveHuffman()
+        for message in messages:
+            self.assertEqual(dec.decode(enc.encode(message)), message)
+
+    def test_docstring_example(self) -> None:
+        self.assertRoundTrips(["hello world hello"])
+
+    def test_new_words_in_one_message(self) -> None:
+        self.assertRoundTrips(["a b"])
+        self.assertRoundTrips(["hi there"])
+
+    def test_trailing_known_word(self) -> None:
+        self.assertRoundTrips(["hi there hi", "there hi", "hi"])
+
+    def test_edge_cases(self) -> None:
+        self.assertRoundTrips(["", " ", "a  b ", " lead", "x" * 1000, "ünï cödé"])
+
+    def test_chat_sessions(self) -> None:
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.assertRoundTrips(_chat_session(seed, 200))
+
+    def test_without_lock(self) -> None:
+        enc, dec = AdaptiveHuffman(thread_safe=False), AdaptiveHuffman(thread_safe=False)
+        for message in _chat_session(42, 50):
+            self.assertEqual(dec.decode(enc.encode(message)), message)
+
+    def test_word_too_long(self) -> None:
+        with self.assertRaises(ValueError):
+            AdaptiveHuffman().encode("x" * 70_000)
+
+
+class WireFormatTest(unittest.TestCase):
+    """Pins the encoded bytes so refactors can't silently change the format."""
+
+    def test_known_session(self) -> None:
+        enc = AdaptiveHuffman()
+        self.assertEqual(enc.encode("hello world hello"), GOLDEN[0])
+        self.assertEqual(enc.encode("hello again world"), GOLDEN[1])
+        self.assertEqual(enc.encode("world world"), GOLDEN[2])
+
+
+GOLDEN = (
+    b"\x80\x00\x05hello\x80\x00\x01 \x00\x00\x05worldU",
+    b"l\x00\x00\x05again\x1c",
+    b"\x85\x80",
+)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Socket-level tests for the length-prefixed framing helpers.
+
+Run as a package module, like test_encoder::
+
+    $ python -m unittest chat_huffman_py.test_framing
+"""
+
+from __future__ import annotations
+
+import socket
+import struct
+import threading
+import unittest
+from typing import List
+from unittest import mock
+
+from . import framing
+from .framing import MAX_PAYLOAD, recv_exact, send_frame
+
+
+class _ShortSendSocket:
+    """Socket wrapper whose sendmsg writes at most *limit* bytes."""
+
+    def __init__(self, sock: socket.socket, limit: int) -> None:
+        self._sock = sock
+        self._limit = limit
+
+    def sendmsg(self, buffers: List[bytes]) -> int:
+        return self._sock.send(b"".join(buffers)[: self._limit])
+
+    def sendall(self, data: bytes) -> None:
+        self._sock.sendall(data)
+
+
+class FramingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tx, self.rx = socket.socketpair()
+        self.addCleanup(self.tx.close)
+        self.addCleanup(self.rx.close)
+
+    def _send_in_thread(self, sock: object, payload: bytes) -> threading.Thread:
+        prefix = struct.pack("!I", len(payload))
+        thread = threading.Thread(target=send_frame, args=(sock, prefix, payload))
+        thread.start()
+        self.addCleanup(thread.join)
+        return thread
+
+    def _recv_frame(self) -> bytearray:
+        (length,) = struct.unpack("!I", self.rx.recv(4, socket.MSG_WAITALL))
+        return recv_exact(self.rx, length)
+
+    def test_rejects_bad_lengths(self) -> None:
+        for length in (0, MAX_PAYLOAD + 1, 0xFFFFFFFF):
+            with self.subTest(length=length), self.assertRaises(ValueError):
+                recv_exact(self.rx, length)
+
+    def test_large_frame(self) -> None:
+        # The payload is bigger than the socket buffers, so sendmsg returns a
+        # partial count (the timeout makes the socket non-blocking
+        # internally) and recv_into fills the buffer over several calls.
+        self.tx.settimeout(10)
+        payload = bytes(range(256)) * (MAX_PAYLOAD // 256)
+        self._send_in_thread(self.tx, payload)
+        self.assertEqual(self._recv_frame(), payload)
+
+    def test_short_sendmsg(self) -> None:
+        payload = b"x" * 100
+        for limit in (2, 4, 50):  # inside the prefix, at its end, in the payload
+            with self.subTest(limit=limit):
+                self._send_in_thread(_ShortSendSocket(self.tx, limit), payload).join()
+                self.assertEqual(self._recv_frame(), payload)
+
+    def test_bytearray_payload_without_sendmsg(self) -> None:
+        payload = bytearray(b"relayed")
+        with mock.patch.object(framing, "_HAS_SENDMSG", False):
+            self._send_in_thread(self.tx, payload).join()
+        self.assertEqual(self._recv_frame(), payload)
+
+    def test_disconnect_mid_payload(self) -> None:
+        self.tx.sendall(b"abc")
+        self.tx.close()
+        with self.assertRaises(ConnectionError):
+            recv_exact(self.rx, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()